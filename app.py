@@ -4,6 +4,9 @@ import requests
 import plotly.express as px
 import streamlit.components.v1 as components
 import numpy as np
+import history
+import pipeline
+import instrumentation
 
 st.set_page_config(
     page_title="MLB Odds Dashboard",
@@ -11,112 +14,21 @@ st.set_page_config(
     layout="wide"
 )
 
-def draw_top_bets_plot_arguments_ets(df, title="", hover_columns=None):
-
-    # Default hover columns
-    base_hover = ['Price', 'ETS Score']
-    if hover_columns:
-        hover_cols = base_hover + hover_columns
-    else:
-        hover_cols = base_hover
-
-    hover_cols = list(set(hover_cols))
-
-    # Sort and mark Pareto-optimal
-    df_sorted = df.sort_values(by='ETS Score', ascending=False).copy()
-
-    df_sorted['is_pareto'] = False
-    positive_roi = df_sorted[df_sorted['ETS Score'] > 0].sort_values(by='ETS Score', ascending=False)
-    pareto_indices, max_price = [], None
-    for idx, row in positive_roi.iterrows():
-        if max_price is None or row['Price'] >= max_price:
-            pareto_indices.append(idx)
-            max_price = row['Price']
-    df_sorted.loc[pareto_indices, 'is_pareto'] = True
-
-    # Assign colors
-    def assign_color(row):
-        if row['ETS Score'] <= 0:
-            return '#5A5A5A'
-        elif row['is_pareto']:
-            return '#FF6F91'
-        else:
-            return '#00B8D9'
-    df_sorted['marker_color'] = df_sorted.apply(assign_color, axis=1)
-
-    # Base scatter plot
-    fig = px.scatter(
-        df_sorted,
-        x='Price',
-        y='ETS Score',
-        hover_data=hover_cols,
-        title=title,
-    )
-    fig.update_traces(marker=dict(size=5), marker_color=df_sorted['marker_color'])
-    fig.add_scatter(
-        x=[None],
-        y=[None],
-        mode='markers',
-        name=' ',
-        marker=dict(opacity=0),
-        showlegend=True
-    )
-
-    # Add dashed Pareto line with custom hover
-    pareto_points = df_sorted[df_sorted['is_pareto']].sort_values(by='Price')
-    if len(pareto_points) >= 2:
-        fig.add_scatter(
-            x=pareto_points['Price'],
-            y=pareto_points['ETS Score'],
-            mode='lines+markers',
-            name='Top Bets',
-            line=dict(color='#FF6F91', width=2, dash='dash'),
-            marker=dict(color='#FF6F91', size=5),
-            customdata=pareto_points[hover_cols],
-            hovertemplate = '<br>'.join([f'{col}: %{{customdata[{i}]}}' for i, col in enumerate(hover_cols)]) + '<extra></extra>'
+def draw_top_bets_plot_arguments_ets(df, title="", hover_columns=None, section=""):
+    with metrics.stage(section, 'frontier', df) as m:
+        df_sorted = pipeline.mark_pareto(df, 'ETS Score')
+        m.output(df_sorted)
+    with metrics.stage(section, 'figure', df_sorted):
+        fig = pipeline.build_top_bets_figure_ets(df_sorted, title, hover_columns)
+    with metrics.stage(section, 'html') as m:
+        html_str = pipeline.figure_html(fig)
+        m.payload(html_str)
+    with metrics.stage(section, 'render'):
+        components.html(
+            f"<div style='display: flex; justify-content: center; align-items: center;'>{html_str}</div>",
+            height=450,
         )
 
-    # Layout and interactivity lock
-    fig.update_layout(
-        width=600,
-        height=400,
-        plot_bgcolor='#121317',
-        paper_bgcolor='#121317',
-        font=dict(color='#FFFFFF'),
-        title_font=dict(size=20, color='#00B8D9'),
-        xaxis=dict(title_font=dict(color='#FFFFFF'), tickfont=dict(color='#FFFFFF')),
-        yaxis=dict(title_font=dict(color='#FFFFFF'), tickfont=dict(color='#FFFFFF')),
-        dragmode=False,
-        hovermode='closest',
-        legend=dict(
-            orientation="h",
-            yanchor="bottom",
-            y=1.02,
-            xanchor="center",
-            x=0.5,
-            font=dict(
-                size=14,           # or whatever matches your theme
-                color='#FFFFFF',
-                family='sans-serif'
-            )
-        ),
-        margin=dict(l=100, r=40, t=110, b=40)
-    )
-
-    # Disable zoom/pan/select, allow hover
-    html_str = fig.to_html(full_html=False, include_plotlyjs='cdn', config={
-        'displayModeBar': False,
-        'staticPlot': False,
-        'scrollZoom': False,
-        'editable': False,
-        'doubleClick': False,
-        'displaylogo': False
-    })
-    components.html(
-        f"<div style='display: flex; justify-content: center; align-items: center;'>{html_str}</div>",
-        height=450,
-    )
-
 
 def draw_top_bets_plot_arguments(df, title="", hover_columns=None):
 
@@ -306,6 +218,45 @@ def draw_top_bets_plot(df, title=""):
 
 
 
+def draw_line_movement_plot(df, title="", y='ETS Score'):
+    # History only stores changes, so each value holds until the next run that moved it
+    with metrics.stage('line_movement', 'figure', df):
+        fig = px.line(
+            df.sort_values(by=history.SNAPSHOT_COLUMN),
+            x=history.SNAPSHOT_COLUMN,
+            y=y,
+            color='Bet',
+            line_shape='hv',
+            markers=True,
+            hover_data=['Price', 'ETS Score'],
+            title=title,
+        )
+
+        fig.update_layout(
+            width=900,
+            height=500,
+            plot_bgcolor='#121317',
+            paper_bgcolor='#121317',
+            font=dict(color='#FFFFFF'),
+            title_font=dict(size=20, color='#00B8D9'),
+            xaxis=dict(title_font=dict(color='#FFFFFF'), tickfont=dict(color='#FFFFFF')),
+            yaxis=dict(title_font=dict(color='#FFFFFF'), tickfont=dict(color='#FFFFFF')),
+            margin=dict(l=40, r=40, t=60, b=40),
+            dragmode=False,
+            hovermode='closest',
+        )
+
+    with metrics.stage('line_movement', 'html') as m:
+        html_str = pipeline.figure_html(fig)
+        m.payload(html_str)
+    with metrics.stage('line_movement', 'render'):
+        components.html(
+            f"<div style='display: flex; justify-content: center; align-items: center;'>{html_str}</div>",
+            height=550,
+        )
+
+
+
 # === Inject Custom CSS for Section Headers ===
 st.markdown(
     """
@@ -338,10 +289,20 @@ st.markdown(
 if st.sidebar.button("🔄 Refresh All Data"):
     st.cache_data.clear()
 
+# === Debug Metrics ===
+debug_panel = st.sidebar.checkbox("🐞 Show Debug Metrics", value=False)
+metrics_logging = bool(st.secrets.get("METRICS_LOGGING", False))
+if metrics_logging:
+    instrumentation.configure_logging()
+metrics = instrumentation.Recorder(enabled=debug_panel, log=metrics_logging)
+
 # === Helper: Numeric Slider ===
 def numeric_slider(df, column, label):
     min_val = float(df[column].min())
     max_val = float(df[column].max())
+    # Streamlit rejects min == max (e.g. a one-game slate); widen so every row stays in range
+    if max_val == min_val:
+        max_val = min_val + 1
     return st.sidebar.slider(
         label,
         min_value=min_val,
@@ -351,65 +312,90 @@ def numeric_slider(df, column, label):
     )
 
 # === Load Data ===
-@st.cache_data
-def load_game_details():
-    return pd.read_csv(st.secrets["GAMES_URL"], index_col=False)
+# Feeds are cached per simulation run (the CURRENT_TIME_URL text): a new run refetches
+# them, so history never records a cached frame under a newer simulation start
+@st.cache_data(max_entries=1)
+def load_game_details(simulation_run):
+    return pipeline.load_csv(st.secrets["GAMES_URL"])
 
-@st.cache_data
-def load_moneyline():
-    return pd.read_csv(st.secrets["H2H_URL"], index_col=False)
+@st.cache_data(max_entries=1)
+def load_moneyline(simulation_run):
+    return pipeline.load_csv(st.secrets["H2H_URL"])
 
-@st.cache_data
-def load_totals():
-    return pd.read_csv(st.secrets["TOTALS_URL"], index_col=False)
+@st.cache_data(max_entries=1)
+def load_totals(simulation_run):
+    return pipeline.load_csv(st.secrets["TOTALS_URL"])
 
-@st.cache_data
-def load_totals_corrected():
-    return pd.read_csv(st.secrets["CORRECTED_TOTALS_URL"], index_col=False)
+@st.cache_data(max_entries=1)
+def load_totals_corrected(simulation_run):
+    return pipeline.load_csv(st.secrets["CORRECTED_TOTALS_URL"])
 
 time_url = st.secrets["CURRENT_TIME_URL"]
 
 # Fetch the time from the URL
-try:
-    response = requests.get(time_url)
-    response.raise_for_status()  # Raise error for bad responses
-    current_time = response.text.strip()
-except Exception as e:
-    current_time = f"Error fetching time: {e}"
+with metrics.stage('current_time', 'load'):
+    try:
+        response = requests.get(time_url)
+        response.raise_for_status()  # Raise error for bad responses
+        current_time = response.text.strip()
+    except Exception as e:
+        current_time = f"Error fetching time: {e}"
 
 # Display in the app
 #st.title("Last Simulation Start")
 st.write(f"Last simulation start time: **{current_time}**")
 
+# === Line-Movement History ===
+HISTORY_DIR = st.secrets.get("HISTORY_DIR", "history")
+simulation_start = pd.to_datetime(current_time, errors='coerce')
+if not pd.isna(simulation_start) and simulation_start.tzinfo is not None:
+    simulation_start = simulation_start.tz_localize(None)
+
+def record_history(market, df):
+    # Append this simulation run to the history store (no-op once recorded)
+    if pd.isna(simulation_start):
+        return
+    try:
+        history.append_snapshot(HISTORY_DIR, market, df, simulation_start)
+    except Exception as e:
+        st.sidebar.warning(f"History not recorded for {market}: {e}")
+
 # === SECTION 1: Game Summary ===
 st.markdown("### <span class='custom-header'>All Games</span>", unsafe_allow_html=True)
-df_game = load_game_details()
+with metrics.stage('games', 'load') as m:
+    df_game = load_game_details(current_time)
+    m.loaded(df_game)
 
 st.sidebar.header("Games Filters")
 game_selected = st.sidebar.multiselect("Game Status", sorted(df_game["Game Status"].dropna().unique()), default=[])
 away_team_selected = st.sidebar.multiselect("Away Team", sorted(df_game["Away Team"].dropna().unique()), default=[])
 home_team_selected = st.sidebar.multiselect("Home Team", sorted(df_game["Home Team"].dropna().unique()), default=[])
 
-filtered_game = df_game.copy()
-if game_selected:
-    filtered_game = filtered_game[filtered_game["Game Status"].isin(game_selected)]
-if away_team_selected:
-    filtered_game = filtered_game[filtered_game["Away Team"].isin(away_team_selected)]
-if home_team_selected:
-    filtered_game = filtered_game[filtered_game["Home Team"].isin(home_team_selected)]
-    
+with metrics.stage('games', 'filter', df_game) as m:
+    filtered_game = pipeline.filter_frame(df_game, isin={
+        "Game Status": game_selected,
+        "Away Team": away_team_selected,
+        "Home Team": home_team_selected,
+    })
+    m.output(filtered_game)
+
 with st.expander("🗓️ Expand to View Daily MLB Games", expanded=False):
-    st.dataframe(filtered_game, use_container_width=True)
+    with metrics.stage('games', 'table', filtered_game):
+        st.dataframe(filtered_game, use_container_width=True)
 
-@st.cache_data
-def load_dfs():
-    return pd.read_csv(st.secrets["DFS_URL"], index_col=False)
+@st.cache_data(max_entries=1)
+def load_dfs(simulation_run):
+    return pipeline.load_csv(st.secrets["DFS_URL"])
 
 # === SECTION 2: DFS Projections ===
 st.markdown("### <span class='custom-header'>DFS Projections</span>", unsafe_allow_html=True)
 
-df_dfs = load_dfs()
-df_dfs.sort_values(by='DFS Mean',ascending=False,inplace=True)
+with metrics.stage('dfs', 'load') as m:
+    df_dfs = load_dfs(current_time)
+    m.loaded(df_dfs)
+with metrics.stage('dfs', 'transform', df_dfs) as m:
+    df_dfs.sort_values(by='DFS Mean',ascending=False,inplace=True)
+    m.output(df_dfs)
 
 st.sidebar.header("DFS Filters")
 dfs_role = st.sidebar.multiselect(
@@ -430,29 +416,38 @@ dfs_lineup_confirmed = st.sidebar.multiselect(
 dfs_mean_range = numeric_slider(df_dfs, "DFS Mean", "DFS Mean Range")
 dfs_conf_range = numeric_slider(df_dfs, "Model Confidence", "Model Confidence Range")
 
-filtered_dfs = df_dfs.copy()
-if dfs_role:
-    filtered_dfs = filtered_dfs[filtered_dfs["Pitcher of Batter"].isin(dfs_role)]
-if dfs_teams:
-    filtered_dfs = filtered_dfs[filtered_dfs["Team"].isin(dfs_teams)]
-if dfs_lineup_confirmed:
-    filtered_dfs = filtered_dfs[filtered_dfs["Lineup Confirmed"].isin(dfs_lineup_confirmed)]
-
-filtered_dfs = filtered_dfs[
-    filtered_dfs["DFS Mean"].between(*dfs_mean_range) &
-    filtered_dfs["Model Confidence"].between(*dfs_conf_range)
-]
+with metrics.stage('dfs', 'filter', df_dfs) as m:
+    filtered_dfs = pipeline.filter_frame(
+        df_dfs,
+        isin={
+            "Pitcher of Batter": dfs_role,
+            "Team": dfs_teams,
+            "Lineup Confirmed": dfs_lineup_confirmed,
+        },
+        between={
+            "DFS Mean": dfs_mean_range,
+            "Model Confidence": dfs_conf_range,
+        },
+    )
+    m.output(filtered_dfs)
 
 with st.expander("🎯 Expand to View DFS Projections for Every Starting Player", expanded=False):
-    st.dataframe(filtered_dfs, use_container_width=True,height=200)
+    with metrics.stage('dfs', 'table', filtered_dfs):
+        st.dataframe(filtered_dfs, use_container_width=True,height=200)
 
 # === SECTION 2: Moneyline Odds ===
 st.markdown("### <span class='custom-header'>Moneyline Odds</span>", unsafe_allow_html=True)
 #st.header("Moneyline Odds")
 
-df_moneyline = load_moneyline()
-df_moneyline['ETS Score'] = np.where(df_moneyline['ETS Score'] == 0, 0, np.sign(df_moneyline['ETS Score']) * np.log1p(np.abs(df_moneyline['ETS Score'])))
-df_moneyline.sort_values(by='ETS Score',ascending=False,inplace=True)
+with metrics.stage('moneyline', 'load') as m:
+    df_moneyline = load_moneyline(current_time)
+    m.loaded(df_moneyline)
+with metrics.stage('moneyline', 'transform', df_moneyline) as m:
+    pipeline.ets_transform(df_moneyline)
+    df_moneyline.sort_values(by='ETS Score',ascending=False,inplace=True)
+    m.output(df_moneyline)
+with metrics.stage('moneyline', 'history', df_moneyline):
+    record_history('moneyline', df_moneyline)
 
 st.sidebar.header("Moneyline Filters")
 
@@ -477,37 +472,40 @@ roi_range_moneyline = numeric_slider(df_moneyline, "Estimated ROI (%)", "ROI (%)
 price_range_moneyline = numeric_slider(df_moneyline, "Price", "Price Range (Moneyline)")
 conf_range_moneyline = numeric_slider(df_moneyline, "Game Confidence", "Game Confidence (Moneyline)")
 
-filtered_moneyline = df_moneyline.copy()
-if mlb_game_ids_moneyline:
-    filtered_moneyline = filtered_moneyline[filtered_moneyline["MLB Game ID"].isin(mlb_game_ids_moneyline)]
-if bookmakers_moneyline:
-    filtered_moneyline = filtered_moneyline[filtered_moneyline["Bookmaker"].isin(bookmakers_moneyline)]
-if teams_moneyline:
-    filtered_moneyline = filtered_moneyline[filtered_moneyline["Team"].isin(teams_moneyline)]
-
-filtered_moneyline = filtered_moneyline[
-    filtered_moneyline["ETS Score"].between(*ets_range_moneyline)
-]
-filtered_moneyline = filtered_moneyline[
-    filtered_moneyline["Game Confidence"].between(*conf_range_moneyline)
-]
-filtered_moneyline = filtered_moneyline[
-    filtered_moneyline["Price"].between(*price_range_moneyline)
-]
-filtered_moneyline = filtered_moneyline[
-    filtered_moneyline["Estimated ROI (%)"].between(*roi_range_moneyline)
-]
+with metrics.stage('moneyline', 'filter', df_moneyline) as m:
+    filtered_moneyline = pipeline.filter_frame(
+        df_moneyline,
+        isin={
+            "MLB Game ID": mlb_game_ids_moneyline,
+            "Bookmaker": bookmakers_moneyline,
+            "Team": teams_moneyline,
+        },
+        between={
+            "ETS Score": ets_range_moneyline,
+            "Game Confidence": conf_range_moneyline,
+            "Price": price_range_moneyline,
+            "Estimated ROI (%)": roi_range_moneyline,
+        },
+    )
+    m.output(filtered_moneyline)
 with st.expander("💸 Expand to View Moneyline Bets", expanded=False):
-    st.dataframe(filtered_moneyline, use_container_width=True,height=200)
+    with metrics.stage('moneyline', 'table', filtered_moneyline):
+        st.dataframe(filtered_moneyline, use_container_width=True,height=200)
 
     #draw_top_bets_plot_arguments(filtered_moneyline,"💸 Moneyline: Price vs ROI",list(filtered_moneyline.columns))
-    draw_top_bets_plot_arguments_ets(filtered_moneyline,"💸 Moneyline: Price vs ETS Score",list(filtered_moneyline.columns))
+    draw_top_bets_plot_arguments_ets(filtered_moneyline,"💸 Moneyline: Price vs ETS Score",list(filtered_moneyline.columns), section='moneyline')
 
 # === SECTION 2.5: Totals Odds Corrected ===
 st.markdown("### <span class='custom-header'>Totals Odds Corrected</span>", unsafe_allow_html=True)
-df_totals_corrected = load_totals_corrected()
-df_totals_corrected['ETS Score'] = np.where(df_totals_corrected['ETS Score'] == 0, 0, np.sign(df_totals_corrected['ETS Score']) * np.log1p(np.abs(df_totals_corrected['ETS Score'])))
-df_totals_corrected.sort_values(by=['ETS Score'],ascending=False, inplace=True)
+with metrics.stage('totals_corrected', 'load') as m:
+    df_totals_corrected = load_totals_corrected(current_time)
+    m.loaded(df_totals_corrected)
+with metrics.stage('totals_corrected', 'transform', df_totals_corrected) as m:
+    pipeline.ets_transform(df_totals_corrected)
+    df_totals_corrected.sort_values(by=['ETS Score'],ascending=False, inplace=True)
+    m.output(df_totals_corrected)
+with metrics.stage('totals_corrected', 'history', df_totals_corrected):
+    record_history('totals_corrected', df_totals_corrected)
 
 st.sidebar.header("Totals Corrected Filters")
 mlb_game_ids_totals_corrected = st.sidebar.multiselect(
@@ -535,26 +533,28 @@ roi_range_totals_corrected = numeric_slider(df_totals_corrected, "Estimated ROI
 price_range_totals_corrected = numeric_slider(df_totals_corrected, "Price", "Price Range (Totals Corrected)")
 conf_range_totals_corrected = numeric_slider(df_totals_corrected, "Game Confidence", "Price Range (Totals Corrected)")
 
-filtered_totals_corrected = df_totals_corrected.copy()
-if mlb_game_ids_totals_corrected:
-    filtered_totals_corrected = filtered_totals_corrected[filtered_totals_corrected["MLB Game ID"].isin(mlb_game_ids_totals_corrected)]
-if away_teams_totals_corrected:
-    filtered_totals_corrected = filtered_totals_corrected[filtered_totals_corrected["Away Team"].isin(away_teams_totals_corrected)]
-if home_teams_totals_corrected:
-    filtered_totals_corrected = filtered_totals_corrected[filtered_totals_corrected["Home Team"].isin(home_teams_totals_corrected)]
-if bookmakers_totals_corrected:
-    filtered_totals_corrected = filtered_totals_corrected[filtered_totals_corrected["Bookmaker"].isin(bookmakers_totals_corrected)]
-
-filtered_totals_corrected = filtered_totals_corrected[
-    filtered_totals_corrected["ETS Score"].between(*ets_range_totals_corrected) &
-    filtered_totals_corrected["Game Confidence"].between(*conf_range_totals_corrected) &
-    filtered_totals_corrected["Price"].between(*price_range_totals_corrected) &
-    filtered_totals_corrected["Estimated ROI (%)"].between(*roi_range_totals_corrected)
-]
+with metrics.stage('totals_corrected', 'filter', df_totals_corrected) as m:
+    filtered_totals_corrected = pipeline.filter_frame(
+        df_totals_corrected,
+        isin={
+            "MLB Game ID": mlb_game_ids_totals_corrected,
+            "Away Team": away_teams_totals_corrected,
+            "Home Team": home_teams_totals_corrected,
+            "Bookmaker": bookmakers_totals_corrected,
+        },
+        between={
+            "ETS Score": ets_range_totals_corrected,
+            "Game Confidence": conf_range_totals_corrected,
+            "Price": price_range_totals_corrected,
+            "Estimated ROI (%)": roi_range_totals_corrected,
+        },
+    )
+    m.output(filtered_totals_corrected)
 with st.expander("🔢 Expand to View Totals Corrected", expanded=False):
-    st.dataframe(filtered_totals_corrected, use_container_width=True,height=200)
+    with metrics.stage('totals_corrected', 'table', filtered_totals_corrected):
+        st.dataframe(filtered_totals_corrected, use_container_width=True,height=200)
     #draw_top_bets_plot_arguments(filtered_totals,"🔢 Totals: Price vs ROI",list(filtered_totals.columns))
-    draw_top_bets_plot_arguments_ets(filtered_totals_corrected,"🔢 Totals: Price vs ETS Score",list(filtered_totals_corrected.columns))
+    draw_top_bets_plot_arguments_ets(filtered_totals_corrected,"🔢 Totals: Price vs ETS Score",list(filtered_totals_corrected.columns), section='totals_corrected')
 
 
 
@@ -562,9 +562,15 @@ with st.expander("🔢 Expand to View Totals Corrected", expanded=False):
 #st.header("Totals Odds")
 st.markdown("### <span class='custom-header'>Totals Odds</span>", unsafe_allow_html=True)
 
-df_totals = load_totals()
-df_totals['ETS Score'] = np.where(df_totals['ETS Score'] == 0, 0, np.sign(df_totals['ETS Score']) * np.log1p(np.abs(df_totals['ETS Score'])))
-df_totals.sort_values(by=['ETS Score'],ascending=False, inplace=True)
+with metrics.stage('totals', 'load') as m:
+    df_totals = load_totals(current_time)
+    m.loaded(df_totals)
+with metrics.stage('totals', 'transform', df_totals) as m:
+    pipeline.ets_transform(df_totals)
+    df_totals.sort_values(by=['ETS Score'],ascending=False, inplace=True)
+    m.output(df_totals)
+with metrics.stage('totals', 'history', df_totals):
+    record_history('totals', df_totals)
 
 # df_totals['Kelly'] = np.where(
 #     df_totals['Estimated ROI (%)'] > 0,
@@ -600,44 +606,52 @@ roi_range_totals = numeric_slider(df_totals, "Estimated ROI (%)", "ROI (%) Range
 price_range_totals = numeric_slider(df_totals, "Price", "Price Range (Totals)")
 conf_range_totals = numeric_slider(df_totals, "Game Confidence", "Price Range (Totals)")
 
-filtered_totals = df_totals.copy()
-if mlb_game_ids_totals:
-    filtered_totals = filtered_totals[filtered_totals["MLB Game ID"].isin(mlb_game_ids_totals)]
-if away_teams_totals:
-    filtered_totals = filtered_totals[filtered_totals["Away Team"].isin(away_teams_totals)]
-if home_teams_totals:
-    filtered_totals = filtered_totals[filtered_totals["Home Team"].isin(home_teams_totals)]
-if bookmakers_totals:
-    filtered_totals = filtered_totals[filtered_totals["Bookmaker"].isin(bookmakers_totals)]
-
-filtered_totals = filtered_totals[
-    filtered_totals["ETS Score"].between(*ets_range_totals) &
-    filtered_totals["Game Confidence"].between(*conf_range_totals) &
-    filtered_totals["Price"].between(*price_range_totals) &
-    filtered_totals["Estimated ROI (%)"].between(*roi_range_totals)
-]
+with metrics.stage('totals', 'filter', df_totals) as m:
+    filtered_totals = pipeline.filter_frame(
+        df_totals,
+        isin={
+            "MLB Game ID": mlb_game_ids_totals,
+            "Away Team": away_teams_totals,
+            "Home Team": home_teams_totals,
+            "Bookmaker": bookmakers_totals,
+        },
+        between={
+            "ETS Score": ets_range_totals,
+            "Game Confidence": conf_range_totals,
+            "Price": price_range_totals,
+            "Estimated ROI (%)": roi_range_totals,
+        },
+    )
+    m.output(filtered_totals)
 with st.expander("🔢 Expand to View Totals", expanded=False):
-    st.dataframe(filtered_totals, use_container_width=True,height=200)
+    with metrics.stage('totals', 'table', filtered_totals):
+        st.dataframe(filtered_totals, use_container_width=True,height=200)
     #draw_top_bets_plot_arguments(filtered_totals,"🔢 Totals: Price vs ROI",list(filtered_totals.columns))
-    draw_top_bets_plot_arguments_ets(filtered_totals,"🔢 Totals: Price vs ETS Score",list(filtered_totals.columns))
+    draw_top_bets_plot_arguments_ets(filtered_totals,"🔢 Totals: Price vs ETS Score",list(filtered_totals.columns), section='totals')
 
 
 
 
-@st.cache_data
-def load_pitcher_props():
-    return pd.read_csv(st.secrets["PITCHER_PROPS_URL"], index_col=False)
+@st.cache_data(max_entries=1)
+def load_pitcher_props(simulation_run):
+    return pipeline.load_csv(st.secrets["PITCHER_PROPS_URL"])
 
 # === SECTION 3: Pitcher Props ===
 st.markdown("### <span class='custom-header'>Pitcher Props</span>", unsafe_allow_html=True)
 #st.header("Pitcher Props")
 
-df_pitcher = load_pitcher_props()
-df_pitcher['ETS Score'] = np.where(df_pitcher['ETS Score'] == 0, 0, np.sign(df_pitcher['ETS Score']) * np.log1p(np.abs(df_pitcher['ETS Score'])))
+with metrics.stage('pitcher_props', 'load') as m:
+    df_pitcher = load_pitcher_props(current_time)
+    m.loaded(df_pitcher)
+with metrics.stage('pitcher_props', 'transform', df_pitcher) as m:
+    pipeline.ets_transform(df_pitcher)
 
-# df_pitcher['Kelly'] = (df_pitcher['Estimated ROI (%)']/100.0)/(df_pitcher['Price']-1)
-# df_pitcher['ETS Score'] = df_pitcher['Kelly']*df_pitcher['Model Confidence']
-df_pitcher.sort_values(by='ETS Score',ascending=False,inplace=True)
+    # df_pitcher['Kelly'] = (df_pitcher['Estimated ROI (%)']/100.0)/(df_pitcher['Price']-1)
+    # df_pitcher['ETS Score'] = df_pitcher['Kelly']*df_pitcher['Model Confidence']
+    df_pitcher.sort_values(by='ETS Score',ascending=False,inplace=True)
+    m.output(df_pitcher)
+with metrics.stage('pitcher_props', 'history', df_pitcher):
+    record_history('pitcher_props', df_pitcher)
 
 st.sidebar.header("Pitcher Prop Filters")
 pitcher_names = st.sidebar.multiselect("Pitcher Name", sorted(df_pitcher["Normalized Name"].dropna().unique()), default=[])
@@ -653,42 +667,49 @@ pitcher_price_range = numeric_slider(df_pitcher, "Price", "Price Range (Pitchers
 #pitcher_point_range = numeric_slider(df_pitcher, "Point", "Point Range (Pitchers)")
 pitcher_conf_range = numeric_slider(df_pitcher, "Model Confidence", "Model Confidence Range (Pitchers)")
 
-filtered_pitcher = df_pitcher.copy()
-if pitcher_names:
-    filtered_pitcher = filtered_pitcher[filtered_pitcher["Normalized Name"].isin(pitcher_names)]
-if pitcher_teams:
-    filtered_pitcher = filtered_pitcher[filtered_pitcher["Team"].isin(pitcher_teams)]
-if pitcher_books:
-    filtered_pitcher = filtered_pitcher[filtered_pitcher["Bookmaker"].isin(pitcher_books)]
-if pitcher_markets:
-    filtered_pitcher = filtered_pitcher[filtered_pitcher["Market"].isin(pitcher_markets)]
-if pitcher_lineup:
-    filtered_pitcher = filtered_pitcher[filtered_pitcher["Lineup Confirmed"].isin(pitcher_lineup)]
-
-filtered_pitcher = filtered_pitcher[
-    filtered_pitcher["ETS Score"].between(*pitcher_ets_range) &
-    filtered_pitcher["Price"].between(*pitcher_price_range) &
-    filtered_pitcher["Estimated ROI (%)"].between(*pitcher_roi_range) &
-    filtered_pitcher["Model Confidence"].between(*pitcher_conf_range)
-]
+with metrics.stage('pitcher_props', 'filter', df_pitcher) as m:
+    filtered_pitcher = pipeline.filter_frame(
+        df_pitcher,
+        isin={
+            "Normalized Name": pitcher_names,
+            "Team": pitcher_teams,
+            "Bookmaker": pitcher_books,
+            "Market": pitcher_markets,
+            "Lineup Confirmed": pitcher_lineup,
+        },
+        between={
+            "ETS Score": pitcher_ets_range,
+            "Price": pitcher_price_range,
+            "Estimated ROI (%)": pitcher_roi_range,
+            "Model Confidence": pitcher_conf_range,
+        },
+    )
+    m.output(filtered_pitcher)
 with st.expander("🤾‍♂️⚾ Expand to View Pitcher Props", expanded=False):
-    st.dataframe(filtered_pitcher, use_container_width=True,height=200)
+    with metrics.stage('pitcher_props', 'table', filtered_pitcher):
+        st.dataframe(filtered_pitcher, use_container_width=True,height=200)
     #draw_top_bets_plot_arguments(filtered_pitcher,"🤾‍♂️⚾ Pitcher Props: Price vs ROI",list(filtered_pitcher.columns))
-    draw_top_bets_plot_arguments_ets(filtered_pitcher,"🤾‍♂️⚾ Pitcher Props: Price vs ETS Score",list(filtered_pitcher.columns))
+    draw_top_bets_plot_arguments_ets(filtered_pitcher,"🤾‍♂️⚾ Pitcher Props: Price vs ETS Score",list(filtered_pitcher.columns), section='pitcher_props')
 
 
-@st.cache_data
-def load_batter_props():
-    return pd.read_csv(st.secrets["BATTER_PROPS_URL"], index_col=False)
+@st.cache_data(max_entries=1)
+def load_batter_props(simulation_run):
+    return pipeline.load_csv(st.secrets["BATTER_PROPS_URL"])
 
 # === SECTION 4: Batter Props ===
 st.markdown("### <span class='custom-header'>Batter Props</span>", unsafe_allow_html=True)
 
 
-df_batter = load_batter_props()
-df_batter['ETS Score'] = np.where(df_batter['ETS Score'] == 0, 0, np.sign(df_batter['ETS Score']) * np.log1p(np.abs(df_batter['ETS Score'])))
+with metrics.stage('batter_props', 'load') as m:
+    df_batter = load_batter_props(current_time)
+    m.loaded(df_batter)
+with metrics.stage('batter_props', 'transform', df_batter) as m:
+    pipeline.ets_transform(df_batter)
 
-df_batter.sort_values(by='ETS Score',ascending=False,inplace=True)
+    df_batter.sort_values(by='ETS Score',ascending=False,inplace=True)
+    m.output(df_batter)
+with metrics.stage('batter_props', 'history', df_batter):
+    record_history('batter_props', df_batter)
 
 st.sidebar.header("Batter Prop Filters")
 batter_names = st.sidebar.multiselect("Batter Name", sorted(df_batter["Normalized Name"].dropna().unique()), default=[])
@@ -702,29 +723,88 @@ batter_roi_range = numeric_slider(df_batter, "Estimated ROI (%)", "ROI (%) Range
 batter_price_range = numeric_slider(df_batter, "Price", "Price Range (Batters)")
 batter_conf_range = numeric_slider(df_batter, "Model Confidence", "Model Confidence Range (Batters)")
 
-filtered_batter = df_batter.copy()
-if batter_names:
-    filtered_batter = filtered_batter[filtered_batter["Normalized Name"].isin(batter_names)]
-if batter_teams:
-    filtered_batter = filtered_batter[filtered_batter["Team"].isin(batter_teams)]
-if batter_books:
-    filtered_batter = filtered_batter[filtered_batter["Bookmaker"].isin(batter_books)]
-if batter_markets:
-    filtered_batter = filtered_batter[filtered_batter["Market"].isin(batter_markets)]
-if batter_lineup:
-    filtered_batter = filtered_batter[filtered_batter["Lineup Confirmed"].isin(batter_lineup)]
-
-filtered_batter = filtered_batter[
-    filtered_batter["ETS Score"].between(*batter_ets_range) &
-    filtered_batter["Estimated ROI (%)"].between(*batter_roi_range) &
-    filtered_batter["Price"].between(*batter_price_range) &
-    filtered_batter["Model Confidence"].between(*batter_conf_range)
-]
+with metrics.stage('batter_props', 'filter', df_batter) as m:
+    filtered_batter = pipeline.filter_frame(
+        df_batter,
+        isin={
+            "Normalized Name": batter_names,
+            "Team": batter_teams,
+            "Bookmaker": batter_books,
+            "Market": batter_markets,
+            "Lineup Confirmed": batter_lineup,
+        },
+        between={
+            "ETS Score": batter_ets_range,
+            "Estimated ROI (%)": batter_roi_range,
+            "Price": batter_price_range,
+            "Model Confidence": batter_conf_range,
+        },
+    )
+    m.output(filtered_batter)
 
 with st.expander("🥎🔨 Expand to View Batter Props", expanded=False):
-    st.dataframe(filtered_batter, use_container_width=True,height=200)
+    with metrics.stage('batter_props', 'table', filtered_batter):
+        st.dataframe(filtered_batter, use_container_width=True,height=200)
     
     #draw_top_bets_plot_arguments(filtered_batter,"🥎🔨 Batter Props: Price vs ROI",list(filtered_batter.columns))
-    draw_top_bets_plot_arguments_ets(filtered_batter,"🥎🔨 Batter Props: Price vs ETS Score",list(filtered_pitcher.columns))
+    draw_top_bets_plot_arguments_ets(filtered_batter,"🥎🔨 Batter Props: Price vs ETS Score",list(filtered_pitcher.columns), section='batter_props')
+
 
+# === SECTION 5: Line Movement ===
+st.markdown("### <span class='custom-header'>Line Movement</span>", unsafe_allow_html=True)
 
+LINE_MOVEMENT_MARKETS = ['moneyline', 'totals_corrected', 'totals', 'pitcher_props', 'batter_props']
+
+# One entry per market, so older simulation runs are evicted instead of piling up
+@st.cache_data(max_entries=len(LINE_MOVEMENT_MARKETS))
+def load_line_movement(market, simulation_start):
+    # Today's partition only, up to the current simulation run, and only the columns the view uses
+    day_start = simulation_start.normalize()
+    descriptors = history.descriptor_columns(HISTORY_DIR, market, start=day_start, end=simulation_start)
+    day_history = history.load_history(
+        HISTORY_DIR, market, start=day_start, end=simulation_start,
+        columns=descriptors + ['Price', 'ETS Score']
+    )
+    movement = history.line_movement(day_history, descriptors=descriptors)
+    if not movement.empty:
+        labels = [col for col in descriptors if col in movement.columns]
+        movement['Bet'] = movement[labels].astype(str).agg(' | '.join, axis=1)
+        day_history = day_history.merge(movement[[history.KEY_COLUMN, 'Bet']], on=history.KEY_COLUMN)
+    return day_history, movement
+
+if pd.isna(simulation_start):
+    st.write("Line movement unavailable: the simulation start time could not be read.")
+else:
+    st.sidebar.header("Line Movement Filters")
+    movement_market = st.sidebar.selectbox("Market (Line Movement)", LINE_MOVEMENT_MARKETS)
+    with metrics.stage('line_movement', 'load') as m:
+        try:
+            movement_history, movement = load_line_movement(movement_market, simulation_start)
+        except Exception as e:
+            # A damaged history store shouldn't take down the rest of the page
+            st.sidebar.warning(f"Line movement not loaded for {movement_market}: {e}")
+            movement_history, movement = pd.DataFrame(), pd.DataFrame()
+        m.output(movement_history)
+
+    with st.expander("📈 Expand to View Line Movement", expanded=False):
+        if movement.empty:
+            st.write("No history recorded yet for today.")
+        else:
+            movement = movement.sort_values(by='ETS Score Move', key=np.abs, ascending=False)
+            with metrics.stage('line_movement', 'table', movement):
+                st.dataframe(movement.drop(columns=[history.KEY_COLUMN]), use_container_width=True, height=200)
+            top_movers = movement.loc[movement['Moves'] > 0, history.KEY_COLUMN].head(10)
+            if len(top_movers):
+                draw_line_movement_plot(
+                    movement_history[movement_history[history.KEY_COLUMN].isin(top_movers)],
+                    "📈 ETS Score Movement (Top 10 Movers)"
+                )
+
+
+# === Debug Metrics Panel ===
+metrics.finish()
+if debug_panel:
+    with st.sidebar.expander("🐞 Debug Metrics", expanded=True):
+        st.write(f"Script run: **{metrics.elapsed_ms():,.0f} ms** across {len(metrics.records)} stages")
+        df_metrics = pd.DataFrame(metrics.records).reindex(columns=instrumentation.COLUMNS)
+        st.dataframe(df_metrics.sort_values(by='wall_ms', ascending=False), use_container_width=True, height=400)
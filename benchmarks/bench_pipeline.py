@@ -0,0 +1,203 @@
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+import pipeline
+from benchmarks.server import feed_secrets, serve_feeds
+from benchmarks.synthetic import SCALES, generate_slate, write_feeds
+
+# === Pipeline Stage Benchmarks ===
+# Usage (from the repo root):
+#   python -m benchmarks.bench_pipeline                  # compare against the stored baseline
+#   python -m benchmarks.bench_pipeline --save           # rewrite the baseline, review with git diff
+#   python -m benchmarks.bench_pipeline --scale game --check
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), 'baselines', 'pipeline.json')
+
+# Feeds that are only parsed, sorted and filtered, with the sort column the app uses (None: unsorted)
+TABLE_FEEDS = {
+    'games': ('GAMES_URL', None),
+    'dfs': ('DFS_URL', 'DFS Mean'),
+}
+# Feeds that go through the full ETS chart pipeline, keyed by their st.secrets URL
+ETS_FEEDS = {
+    'moneyline': 'H2H_URL',
+    'totals_corrected': 'CORRECTED_TOTALS_URL',
+    'totals': 'TOTALS_URL',
+    'pitcher_props': 'PITCHER_PROPS_URL',
+    'batter_props': 'BATTER_PROPS_URL',
+}
+STAGES = ['download', 'parse', 'ets_transform', 'sort', 'filter', 'frontier', 'figure', 'html']
+
+
+def _time(make_input, fn, repeat):
+    # Median wall time in ms; inputs are rebuilt outside the timer since some stages mutate
+    timings, result = [], None
+    for _ in range(repeat):
+        arg = make_input()
+        start = time.perf_counter()
+        result = fn(arg)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings), result
+
+
+def _time_load(url, repeat):
+    # load_csv times the loopback download and the parse separately; report them apart
+    # so network jitter can't hide a parse regression
+    downloads, parses, df = [], [], None
+    for _ in range(repeat):
+        df = pipeline.load_csv(url)
+        downloads.append(df.attrs['source']['download_ms'])
+        parses.append(df.attrs['source']['parse_ms'])
+    return statistics.median(downloads), statistics.median(parses), df
+
+
+def _filter_spec(df):
+    # What a user typically does: pick half the books and pull every slider in from the ends
+    books = sorted(df['Bookmaker'].dropna().unique())
+    confidence = 'Game Confidence' if 'Game Confidence' in df.columns else 'Model Confidence'
+    between = {
+        column: (df[column].quantile(0.05), df[column].quantile(0.95))
+        for column in ['ETS Score', 'Price', 'Estimated ROI (%)', confidence]
+    }
+    return {'Bookmaker': books[:max(1, len(books) // 2)]}, between
+
+
+def _table_filter_spec(df):
+    # Games: pick half the statuses. DFS: one role, and pull both sliders in from the ends
+    if 'DFS Mean' not in df.columns:
+        statuses = sorted(df['Game Status'].dropna().unique())
+        return {'Game Status': statuses[:max(1, len(statuses) // 2)]}, None
+    between = {
+        column: (df[column].quantile(0.05), df[column].quantile(0.95))
+        for column in ['DFS Mean', 'Model Confidence']
+    }
+    return {'Pitcher of Batter': ['Batter']}, between
+
+
+def _sorter(column):
+    def sort(df):
+        df.sort_values(by=column, ascending=False, inplace=True)
+        return df
+    return sort
+
+
+def bench_table_feed(url, sort_column, repeat):
+    timings = {}
+    timings['download'], timings['parse'], df = _time_load(url, repeat)
+    if sort_column:
+        timings['sort'], df = _time(df.copy, _sorter(sort_column), repeat)
+
+    isin, between = _table_filter_spec(df)
+    timings['filter'], filtered = _time(lambda: df, lambda d: pipeline.filter_frame(d, isin, between), repeat)
+
+    timings['rows_in'] = len(df)
+    timings['rows_out'] = len(filtered)
+    return timings
+
+
+def bench_feed(url, repeat):
+    timings = {}
+    timings['download'], timings['parse'], raw = _time_load(url, repeat)
+    timings['ets_transform'], transformed = _time(raw.copy, pipeline.ets_transform, repeat)
+    timings['sort'], df = _time(transformed.copy, _sorter('ETS Score'), repeat)
+
+    isin, between = _filter_spec(df)
+    timings['filter'], filtered = _time(lambda: df, lambda d: pipeline.filter_frame(d, isin, between), repeat)
+    timings['frontier'], marked = _time(lambda: filtered, pipeline.mark_pareto, repeat)
+
+    # Hover columns come from the filtered frame, as in the app; the figure gets the marked frame
+    hover_columns = list(filtered.columns)
+    timings['figure'], fig = _time(
+        lambda: marked, lambda d: pipeline.build_top_bets_figure_ets(d, "Benchmark", hover_columns), repeat
+    )
+    timings['html'], html_str = _time(lambda: fig, pipeline.figure_html, repeat)
+
+    timings['rows_in'] = len(raw)
+    timings['rows_out'] = len(filtered)
+    timings['html_bytes'] = len(html_str.encode('utf-8'))
+    return timings
+
+
+def run(scales, repeat):
+    results = {}
+    for scale in scales:
+        slate = generate_slate(**SCALES[scale])
+        with tempfile.TemporaryDirectory() as directory:
+            write_feeds(slate, directory)
+            with serve_feeds(directory) as base_url:
+                secrets = feed_secrets(base_url)
+                results[scale] = {
+                    feed: bench_table_feed(secrets[secret], sort_column, repeat)
+                    for feed, (secret, sort_column) in TABLE_FEEDS.items()
+                }
+                results[scale].update({feed: bench_feed(secrets[secret], repeat) for feed, secret in ETS_FEEDS.items()})
+    return results
+
+
+def compare(results, baseline, tolerance):
+    regressions = []
+    print(f"{'scale':<18}{'feed':<18}{'stage':<15}{'ms':>10}{'baseline':>10}{'diff':>9}")
+    for scale, feeds in results.items():
+        for feed, timings in feeds.items():
+            for stage in STAGES:
+                if stage not in timings:
+                    continue
+                ms = timings[stage]
+                base = baseline.get(scale, {}).get(feed, {}).get(stage)
+                if base is None:
+                    print(f"{scale:<18}{feed:<18}{stage:<15}{ms:>10.2f}{'-':>10}{'-':>9}")
+                    continue
+                diff = (ms - base) / base if base else 0.0
+                # Ignore sub-millisecond jitter on tiny stages
+                flag = diff > tolerance and ms - base > 1.0
+                if flag:
+                    regressions.append((scale, feed, stage))
+                print(f"{scale:<18}{feed:<18}{stage:<15}{ms:>10.2f}{base:>10.2f}{diff:>+9.0%}{'  REGRESSION' if flag else ''}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time every dashboard pipeline stage on synthetic slates.")
+    parser.add_argument('--scale', nargs='+', choices=list(SCALES), default=list(SCALES))
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--tolerance', type=float, default=0.25, help="Allowed slowdown before flagging, as a fraction.")
+    parser.add_argument('--baseline', default=BASELINE_PATH)
+    parser.add_argument('--save', action='store_true', help="Write these results as the new baseline.")
+    parser.add_argument('--check', action='store_true', help="Exit non-zero when a stage regresses.")
+    args = parser.parse_args(argv)
+
+    results = run(args.scale, args.repeat)
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    regressions = compare(results, baseline, args.tolerance)
+
+    if args.save:
+        # Merge so saving one scale keeps the others; rounded so diffs stay readable
+        for scale, feeds in results.items():
+            baseline[scale] = {
+                feed: {key: round(value, 2) for key, value in timings.items()}
+                for feed, timings in feeds.items()
+            }
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        with open(args.baseline, 'w') as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+            f.write('\n')
+        print(f"Baseline written to {args.baseline}")
+
+    if regressions:
+        print(f"{len(regressions)} stage(s) slower than baseline by more than {args.tolerance:.0%}")
+        if args.check:
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,209 @@
+import argparse
+import json
+import multiprocessing
+import os
+import resource
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from benchmarks.server import feed_secrets, serve_feeds
+from benchmarks.synthetic import SCALES, generate_slate, write_feeds
+
+# === Multi-Session Load Test ===
+# Replays scripted sessions against app.py with Streamlit's AppTest and reports
+# rerun latency and RSS per concurrency level.
+#
+# AppTest swaps process-wide state (Runtime instance, st.secrets) on every run,
+# so each session gets its own process, and with it its own st.cache_data: every
+# session pays for the feed downloads, and total RSS is an upper bound on what
+# one replica serving the same sessions would hold. To approximate one replica, whose
+# sessions share a single GIL, all session processes are pinned to the same
+# --cpus cores (Linux only; elsewhere they spread across cores and the numbers
+# are optimistic).
+#
+# Expanders are not in the script: Streamlit executes expander bodies on every
+# rerun whether or not they are open, so opening a section is client-side only.
+#
+# Usage (from the repo root):
+#   python -m benchmarks.loadtest                          # slate feeds, concurrency 1 2 4 8
+#   python -m benchmarks.loadtest --concurrency 1 4 16 --scale slate_many_books
+#   python -m benchmarks.loadtest --save                   # rewrite the baseline, review with git diff
+
+APP_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'app.py')
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), 'baselines', 'loadtest.json')
+
+
+def _sidebar_widget(at, kind, label):
+    return next(w for w in getattr(at.sidebar, kind) if w.label == label)
+
+
+def _narrow(at, label):
+    # Pull both ends of a range slider in by a quarter
+    slider = _sidebar_widget(at, 'slider', label)
+    low, high = slider.min, slider.max
+    quarter = (high - low) / 4
+    slider.set_range(low + quarter, high - quarter)
+
+
+def _pick_first(at, label):
+    multiselect = _sidebar_widget(at, 'multiselect', label)
+    multiselect.select(multiselect.options[0])
+
+
+def _clear(at, label):
+    multiselect = _sidebar_widget(at, 'multiselect', label)
+    for value in list(multiselect.value):
+        multiselect.unselect(value)
+
+
+# Each step sets up one widget interaction; the rerun it triggers is what gets timed
+SESSION = [
+    ('open page', lambda at: None),
+    ('pick book (moneyline)', lambda at: _pick_first(at, 'Bookmaker (Moneyline)')),
+    ('narrow ETS (moneyline)', lambda at: _narrow(at, 'ETS Range (Moneyline)')),
+    ('pick DFS team', lambda at: _pick_first(at, 'Team (DFS)')),
+    ('pick market (batters)', lambda at: _pick_first(at, 'Market (Batters)')),
+    ('narrow price (batters)', lambda at: _narrow(at, 'Price Range (Batters)')),
+    ('narrow ETS (pitchers)', lambda at: _narrow(at, 'ETS Range (Pitchers)')),
+    ('line movement market', lambda at: _sidebar_widget(at, 'selectbox', 'Market (Line Movement)').select('batter_props')),
+    ('clear book (moneyline)', lambda at: _clear(at, 'Bookmaker (Moneyline)')),
+]
+
+
+def _rss_mib():
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    # Peak rather than current RSS; KiB on Linux, bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def run_session(secrets, rounds, cpus, timeout, results):
+    if cpus and hasattr(os, 'sched_setaffinity'):
+        os.sched_setaffinity(0, cpus)
+    from streamlit.testing.v1 import AppTest
+
+    rss_start = None
+    timings = []
+    try:
+        for _ in range(rounds):
+            at = AppTest.from_file(APP_PATH, default_timeout=timeout)
+            for key, value in secrets.items():
+                at.secrets[key] = value
+            for step, interact in SESSION:
+                if step != 'open page':
+                    interact(at)
+                start = time.perf_counter()
+                at.run()
+                timings.append((step, (time.perf_counter() - start) * 1000))
+                if at.exception:
+                    raise RuntimeError(f"{step}: {at.exception[0].message}")
+                if rss_start is None:
+                    # Baseline after the cold run, so growth excludes imports and the first feed load
+                    rss_start = _rss_mib()
+    except Exception as e:
+        # Always report back, otherwise the parent blocks on the queue
+        results.put({'error': f"{type(e).__name__}: {e}"})
+        return
+    results.put({'timings': timings, 'rss_start': rss_start, 'rss_end': _rss_mib()})
+
+
+def run_level(concurrency, secrets, rounds, cpus, timeout):
+    ctx = multiprocessing.get_context('spawn')
+    results = ctx.Queue()
+    workers = [
+        ctx.Process(target=run_session, args=(secrets, rounds, cpus, timeout, results))
+        for _ in range(concurrency)
+    ]
+    for worker in workers:
+        worker.start()
+    sessions = [results.get() for _ in workers]
+    for worker in workers:
+        worker.join()
+    errors = [session['error'] for session in sessions if 'error' in session]
+    if errors:
+        raise RuntimeError(f"{len(errors)} of {concurrency} session(s) failed: {errors[0]}")
+
+    # The first 'open page' of each process loads the feeds; everything else is a warm rerun
+    cold, warm = [], []
+    for session in sessions:
+        cold.append(session['timings'][0][1])
+        warm.extend(ms for _, ms in session['timings'][1:])
+    growth = [session['rss_end'] - session['rss_start'] for session in sessions]
+    total = sum(session['rss_end'] for session in sessions)
+    return {
+        'sessions': concurrency,
+        'reruns': len(warm),
+        'cold_ms': round(float(np.median(cold)), 1),
+        'p50_ms': round(float(np.percentile(warm, 50)), 1),
+        'p95_ms': round(float(np.percentile(warm, 95)), 1),
+        'max_ms': round(float(np.max(warm)), 1),
+        'rss_growth_mib': round(float(np.mean(growth)), 1),
+        'rss_growth_max_mib': round(float(np.max(growth)), 1),
+        'rss_total_mib': round(float(total), 1),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay scripted sessions against app.py and report rerun latency and RSS.")
+    parser.add_argument('--concurrency', nargs='+', type=int, default=[1, 2, 4, 8])
+    parser.add_argument('--scale', choices=list(SCALES), default='slate')
+    parser.add_argument('--rounds', type=int, default=2, help="Sessions replayed back-to-back by each process.")
+    parser.add_argument('--cpus', type=int, default=1, help="Cores shared by all sessions (0 leaves affinity alone).")
+    parser.add_argument('--slo-ms', type=float, default=2000.0, help="p95 rerun latency budget used for the capacity number.")
+    parser.add_argument('--timeout', type=float, default=300.0, help="Per-rerun timeout in seconds.")
+    parser.add_argument('--baseline', default=BASELINE_PATH)
+    parser.add_argument('--save', action='store_true', help="Write these results as the new baseline.")
+    args = parser.parse_args(argv)
+
+    cpus = set(sorted(os.sched_getaffinity(0))[:args.cpus]) if args.cpus and hasattr(os, 'sched_getaffinity') else None
+
+    levels = []
+    with tempfile.TemporaryDirectory() as directory:
+        write_feeds(generate_slate(**SCALES[args.scale]), directory)
+        with serve_feeds(directory) as base_url:
+            secrets = feed_secrets(base_url)
+            secrets['HISTORY_DIR'] = os.path.join(directory, 'history')
+            print("Each session runs in its own process with its own st.cache_data; caches are not shared.")
+            print(f"{'sessions':>9}{'reruns':>8}{'cold ms':>10}{'p50 ms':>10}{'p95 ms':>10}{'max ms':>10}"
+                  f"{'RSS +MiB':>10}{'RSS MiB':>10}")
+            for concurrency in args.concurrency:
+                level = run_level(concurrency, secrets, args.rounds, cpus, args.timeout)
+                levels.append(level)
+                print(f"{level['sessions']:>9}{level['reruns']:>8}{level['cold_ms']:>10.1f}{level['p50_ms']:>10.1f}"
+                      f"{level['p95_ms']:>10.1f}{level['max_ms']:>10.1f}{level['rss_growth_mib']:>10.1f}"
+                      f"{level['rss_total_mib']:>10.1f}")
+
+    # Highest level before the first miss, so a noisy pass further up can't overstate it
+    capacity = 0
+    for level in sorted(levels, key=lambda level: level['sessions']):
+        if level['p95_ms'] > args.slo_ms:
+            break
+        capacity = level['sessions']
+    print(f"Capacity: {capacity} concurrent session(s) at p95 <= {args.slo_ms:.0f} ms "
+          f"({args.scale} feeds, {args.cpus or 'unpinned'} cpu)")
+
+    if args.save:
+        baseline = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline) as f:
+                baseline = json.load(f)
+        baseline[args.scale] = {'cpus': args.cpus, 'slo_ms': args.slo_ms, 'capacity': capacity, 'levels': levels}
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        with open(args.baseline, 'w') as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+            f.write('\n')
+        print(f"Baseline written to {args.baseline}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
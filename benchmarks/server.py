@@ -0,0 +1,31 @@
+import contextlib
+import functools
+import threading
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+from benchmarks.synthetic import FEED_FILES
+
+# === Local Stand-In for the st.secrets Feed URLs ===
+
+
+class _QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+@contextlib.contextmanager
+def serve_feeds(directory):
+    # Serve a feed directory on an ephemeral localhost port for the duration of the block
+    handler = functools.partial(_QuietHandler, directory=directory)
+    server = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def feed_secrets(base_url):
+    return {secret: f"{base_url}/{filename}" for secret, filename in FEED_FILES.items()}
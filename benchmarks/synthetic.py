@@ -0,0 +1,166 @@
+import os
+import numpy as np
+import pandas as pd
+
+# === Synthetic Slate Generator ===
+# Produces feeds with the column sets and cardinalities of the live CSVs:
+# one row per team/book for moneyline, side x alt line x book for totals,
+# player x market x line x side x book for props.
+
+TEAMS = [
+    'ARI', 'ATL', 'BAL', 'BOS', 'CHC', 'CWS', 'CIN', 'CLE', 'COL', 'DET',
+    'HOU', 'KC', 'LAA', 'LAD', 'MIA', 'MIL', 'MIN', 'NYM', 'NYY', 'OAK',
+    'PHI', 'PIT', 'SD', 'SF', 'SEA', 'STL', 'TB', 'TEX', 'TOR', 'WSH',
+]
+BOOKMAKERS = [
+    'DraftKings', 'FanDuel', 'BetMGM', 'Caesars', 'BetRivers', 'ESPN BET', 'Fanatics', 'Hard Rock',
+    'bet365', 'PointsBet', 'Unibet', 'WynnBET', 'SuperBook', 'Bovada', 'BetOnline', 'MyBookie',
+    'LowVig', 'BetUS', 'Pinnacle', 'Circa', 'Betfair', 'William Hill', 'Borgata', 'SI Sportsbook',
+]
+PITCHER_MARKETS = ['pitcher_strikeouts', 'pitcher_outs', 'pitcher_hits_allowed', 'pitcher_earned_runs']
+BATTER_MARKETS = ['batter_hits', 'batter_total_bases', 'batter_home_runs', 'batter_rbis', 'batter_runs_scored', 'batter_hits_runs_rbis']
+GAME_STATUSES = ['Scheduled', 'Pre-Game', 'Warmup', 'In Progress', 'Final']
+
+# Named scales, from a single game to a full slate across many books
+SCALES = {
+    'game': dict(n_games=1, n_books=4),
+    'slate': dict(n_games=15, n_books=8),
+    'slate_many_books': dict(n_games=15, n_books=24),
+}
+
+# Feed file per st.secrets key
+FEED_FILES = {
+    'GAMES_URL': 'games.csv',
+    'DFS_URL': 'dfs.csv',
+    'H2H_URL': 'moneyline.csv',
+    'TOTALS_URL': 'totals.csv',
+    'CORRECTED_TOTALS_URL': 'totals_corrected.csv',
+    'PITCHER_PROPS_URL': 'pitcher_props.csv',
+    'BATTER_PROPS_URL': 'batter_props.csv',
+    'CURRENT_TIME_URL': 'current_time.txt',
+}
+
+
+def _priced(rng, df):
+    # Decimal odds, a model edge around the implied probability, and the scores derived from it
+    n = len(df)
+    df['Price'] = np.round(rng.uniform(1.3, 4.5, n), 2)
+    df['Implied Probability'] = np.round(1 / df['Price'], 4)
+    df['Model Probability'] = np.clip(df['Implied Probability'] + rng.normal(0, 0.04, n), 0.01, 0.99).round(4)
+    df['Estimated ROI (%)'] = np.round((df['Model Probability'] * df['Price'] - 1) * 100, 2)
+    df['Kelly'] = np.round(np.maximum(df['Estimated ROI (%)'] / 100.0, 0) / (df['Price'] - 1), 4)
+    # Raw ETS scores are heavy tailed, which is why the app log-scales them
+    df['ETS Score'] = np.round(np.sign(df['Estimated ROI (%)']) * rng.lognormal(0, 1.5, n), 4)
+    return df
+
+
+def _games(rng, n_games):
+    teams = rng.permutation(TEAMS)[:2 * n_games]
+    start = pd.Timestamp('2026-10-18 13:05')
+    return pd.DataFrame({
+        'MLB Game ID': 776000 + np.arange(n_games),
+        'Game Date': start.strftime('%Y-%m-%d'),
+        'Start Time': [(start + pd.Timedelta(minutes=35 * i)).strftime('%H:%M') for i in range(n_games)],
+        'Game Status': rng.choice(GAME_STATUSES, n_games),
+        'Away Team': teams[:n_games],
+        'Home Team': teams[n_games:],
+        'Away Probable Pitcher': [f'Pitcher {t} A' for t in teams[:n_games]],
+        'Home Probable Pitcher': [f'Pitcher {t} H' for t in teams[n_games:]],
+        'Away Win Probability': np.round(rng.uniform(0.3, 0.7, n_games), 3),
+        'Projected Total': np.round(rng.uniform(6.5, 11.5, n_games), 2),
+        'Game Confidence': np.round(rng.uniform(0, 1, n_games), 3),
+    })
+
+
+def _players(games):
+    rows = []
+    for g in games.to_dict('records'):
+        for side, team, opponent in [('A', g['Away Team'], g['Home Team']), ('H', g['Home Team'], g['Away Team'])]:
+            rows.append((g['MLB Game ID'], team, opponent, f'Pitcher {team} {side}', 'Pitcher', 0))
+            rows.extend((g['MLB Game ID'], team, opponent, f'Batter {team} {slot}', 'Batter', slot) for slot in range(1, 10))
+    return pd.DataFrame(rows, columns=['MLB Game ID', 'Team', 'Opponent', 'Normalized Name', 'Pitcher of Batter', 'Batting Order'])
+
+
+def _dfs(rng, players):
+    df = players.copy()
+    n = len(df)
+    df['Lineup Confirmed'] = rng.choice([True, False], n, p=[0.7, 0.3])
+    df['Salary'] = rng.integers(20, 110, n) * 100
+    df['DFS Mean'] = np.round(np.where(df['Pitcher of Batter'] == 'Pitcher', rng.normal(16, 5, n), rng.normal(8, 3, n)), 2)
+    df['DFS Std'] = np.round(df['DFS Mean'].abs() * rng.uniform(0.3, 0.8, n), 2)
+    df['DFS Ceiling'] = np.round(df['DFS Mean'] + 2 * df['DFS Std'], 2)
+    df['Model Confidence'] = np.round(rng.uniform(0, 1, n), 3)
+    return df
+
+
+def _moneyline(rng, games, books):
+    rows = [
+        (g['MLB Game ID'], g['Away Team'], g['Home Team'], team, book, g['Game Confidence'])
+        for g in games.to_dict('records') for team in (g['Away Team'], g['Home Team']) for book in books
+    ]
+    df = pd.DataFrame(rows, columns=['MLB Game ID', 'Away Team', 'Home Team', 'Team', 'Bookmaker', 'Game Confidence'])
+    return _priced(rng, df)
+
+
+def _totals(rng, games, books, alt_lines):
+    rows = [
+        (g['MLB Game ID'], g['Away Team'], g['Home Team'], book, side,
+         round(g['Projected Total'] * 2) / 2 + offset, g['Game Confidence'])
+        for g in games.to_dict('records') for book in books for side in ('Over', 'Under') for offset in alt_lines
+    ]
+    df = pd.DataFrame(rows, columns=['MLB Game ID', 'Away Team', 'Home Team', 'Bookmaker', 'Over/Under', 'Point', 'Game Confidence'])
+    return _priced(rng, df)
+
+
+def _props(rng, players, books, markets, points):
+    rows = [
+        (p['MLB Game ID'], p['Normalized Name'], p['Team'], p['Opponent'], book, market, side, point)
+        for p in players.to_dict('records') for market in markets for point in points[market]
+        for side in ('Over', 'Under') for book in books
+    ]
+    df = pd.DataFrame(rows, columns=['MLB Game ID', 'Normalized Name', 'Team', 'Opponent', 'Bookmaker', 'Market', 'Over/Under', 'Point'])
+    df['Lineup Confirmed'] = rng.choice([True, False], len(df), p=[0.7, 0.3])
+    df['Model Confidence'] = np.round(rng.uniform(0, 1, len(df)), 3)
+    return _priced(rng, df)
+
+
+def generate_slate(n_games=15, n_books=8, seed=0):
+    rng = np.random.default_rng(seed)
+    books = BOOKMAKERS[:n_books]
+    games = _games(rng, n_games)
+    players = _players(games)
+    pitchers = players[players['Pitcher of Batter'] == 'Pitcher']
+    batters = players[players['Pitcher of Batter'] == 'Batter']
+    return {
+        'games': games,
+        'dfs': _dfs(rng, players),
+        'moneyline': _moneyline(rng, games, books),
+        'totals': _totals(rng, games, books, alt_lines=[-1.0, 0.0, 1.0]),
+        'totals_corrected': _totals(rng, games, books, alt_lines=[0.0]),
+        'pitcher_props': _props(rng, pitchers, books, PITCHER_MARKETS, {
+            'pitcher_strikeouts': [4.5, 5.5, 6.5],
+            'pitcher_outs': [15.5, 17.5],
+            'pitcher_hits_allowed': [4.5, 5.5],
+            'pitcher_earned_runs': [1.5, 2.5],
+        }),
+        'batter_props': _props(rng, batters, books, BATTER_MARKETS, {
+            'batter_hits': [0.5, 1.5],
+            'batter_total_bases': [1.5, 2.5],
+            'batter_home_runs': [0.5],
+            'batter_rbis': [0.5],
+            'batter_runs_scored': [0.5],
+            'batter_hits_runs_rbis': [1.5, 2.5],
+        }),
+    }
+
+
+def write_feeds(slate, directory, simulation_start='2026-10-18 10:00:00'):
+    os.makedirs(directory, exist_ok=True)
+    for secret, filename in FEED_FILES.items():
+        path = os.path.join(directory, filename)
+        if secret == 'CURRENT_TIME_URL':
+            with open(path, 'w') as f:
+                f.write(simulation_start)
+        else:
+            slate[os.path.splitext(filename)[0]].to_csv(path, index=False)
+    return directory
@@ -0,0 +1 @@
+# Keeps the top-level app modules (history, pipeline, ...) importable when running plain `pytest`
@@ -0,0 +1,212 @@
+import os
+import glob
+import json
+import tempfile
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+
+try:
+    import fcntl
+except ImportError:
+    # Windows: no advisory locks, appends are only safe from one session at a time
+    fcntl = None
+
+# === Line-Movement History Store ===
+# Layout: <root>/market=<market>/date=<YYYY-MM-DD>/<YYYYmmddTHHMMSS>.parquet
+# Each run file holds only the rows that changed since the previous run of the
+# same day, so unchanged rows cost nothing. Day partitions are self-contained:
+# the first run of a day stores the full snapshot and fixes the day's key and
+# tracked columns (_schema.json), so a feed that gains, drops or blanks a column
+# mid-day does not re-key its rows.
+
+SNAPSHOT_COLUMN = 'Simulation Start'
+KEY_COLUMN = 'Row Key'
+HASH_COLUMN = 'Row Hash'
+LATEST_FILE = '_latest.parquet'  # not matched by the run-file glob
+LOCK_FILE = '_append.lock'
+SCHEMA_FILE = '_schema.json'
+RUN_FORMAT = '%Y%m%dT%H%M%S'
+
+# Columns that move between simulation runs rather than identify a bet
+VOLATILE_COLUMNS = [
+    'Price', 'ETS Score', 'Estimated ROI (%)', 'Game Confidence', 'Model Confidence',
+    'Lineup Confirmed', 'Game Status', 'Kelly',
+]
+
+
+def key_columns(df):
+    # Identify a bet by its non-numeric descriptors (plus the line it is priced at)
+    return [
+        col for col in df.columns
+        if col not in VOLATILE_COLUMNS and col not in (KEY_COLUMN, SNAPSHOT_COLUMN)
+        and (col == 'Point' or not pd.api.types.is_float_dtype(df[col]))
+    ]
+
+
+def _hash(df):
+    return pd.util.hash_pandas_object(df, index=False).to_numpy().view('int64')
+
+
+def _day_dir(root, market, day):
+    return os.path.join(root, f"market={market}", f"date={day:%Y-%m-%d}")
+
+
+def _write_atomic(df, path):
+    _replace_atomic(path, lambda tmp_path: df.to_parquet(tmp_path, index=False))
+
+
+def _replace_atomic(path, write):
+    # Unique temp file per writer so concurrent sessions never share one
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+    os.close(fd)
+    try:
+        write(tmp_path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def append_snapshot(root, market, df, simulation_start):
+    simulation_start = pd.Timestamp(simulation_start)
+    day_dir = _day_dir(root, market, simulation_start)
+    run_path = os.path.join(day_dir, f"{simulation_start.strftime(RUN_FORMAT)}.parquet")
+    if os.path.exists(run_path):
+        # Already recorded (every rerun of the script lands here)
+        return 0
+    os.makedirs(day_dir, exist_ok=True)
+
+    # Sessions that see a new simulation start together race to record it;
+    # the lock serialises the check and the _latest read-modify-write
+    with open(os.path.join(day_dir, LOCK_FILE), 'w') as lock:
+        if fcntl is not None:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+        if os.path.exists(run_path):
+            return 0
+        return _append_locked(day_dir, run_path, df, simulation_start)
+
+
+def _read_schema(day_dir):
+    path = os.path.join(day_dir, SCHEMA_FILE)
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+def _write_schema(day_dir, schema):
+    def write(tmp_path):
+        with open(tmp_path, 'w') as f:
+            json.dump(schema, f)
+    _replace_atomic(os.path.join(day_dir, SCHEMA_FILE), write)
+
+
+def _append_locked(day_dir, run_path, df, simulation_start):
+    schema = _read_schema(day_dir)
+    if schema is None and len(df):
+        # First rows of the day fix what identifies a bet and what counts as a change
+        columns = [col for col in df.columns if col not in (KEY_COLUMN, SNAPSHOT_COLUMN)]
+        schema = {'keys': key_columns(df), 'columns': columns}
+        _write_schema(day_dir, schema)
+    if schema is None:
+        keys = hashes = np.empty(0, dtype='int64')
+    else:
+        # Columns missing from this snapshot hash as NaN; columns added since are ignored
+        keys = _hash(df.reindex(columns=schema['keys']))
+        hashes = _hash(df.reindex(columns=schema['columns']))
+
+    latest_path = os.path.join(day_dir, LATEST_FILE)
+    if os.path.exists(latest_path):
+        latest = pd.read_parquet(latest_path)
+        prev_index = pd.Index(latest[KEY_COLUMN])
+        prev_hashes = latest[HASH_COLUMN].to_numpy()
+        pos = prev_index.get_indexer(keys)
+        changed = pos == -1
+        seen = ~changed
+        changed[seen] = prev_hashes[pos[seen]] != hashes[seen]
+    else:
+        latest = pd.DataFrame(columns=[KEY_COLUMN, HASH_COLUMN])
+        changed = np.ones(len(df), dtype=bool)
+
+    delta = df[changed].copy()
+    delta[KEY_COLUMN] = keys[changed]
+    delta[SNAPSHOT_COLUMN] = simulation_start
+    _write_atomic(delta.reset_index(drop=True), run_path)
+
+    current = pd.DataFrame({KEY_COLUMN: keys, HASH_COLUMN: hashes})
+    latest = pd.concat([latest, current], ignore_index=True).drop_duplicates(KEY_COLUMN, keep='last')
+    _write_atomic(latest.astype('int64'), latest_path)
+    return len(delta)
+
+
+def _run_files(root, market, start=None, end=None):
+    start = pd.Timestamp(start) if start is not None else None
+    end = pd.Timestamp(end) if end is not None else None
+    for day_dir in sorted(glob.glob(os.path.join(root, f"market={market}", "date=*"))):
+        day = pd.Timestamp(os.path.basename(day_dir).split('=', 1)[1])
+        # Prune whole day partitions before listing their files
+        if start is not None and day < start.normalize():
+            continue
+        if end is not None and day > end.normalize():
+            continue
+        for path in sorted(glob.glob(os.path.join(day_dir, "[0-9]*.parquet"))):
+            run = pd.to_datetime(os.path.basename(path)[:-len('.parquet')], format=RUN_FORMAT)
+            if start is not None and run < start:
+                continue
+            if end is not None and run > end:
+                continue
+            yield path
+
+
+def descriptor_columns(root, market, start=None, end=None):
+    # Key columns fixed for each day in the window, in first-seen order
+    descriptors = {}
+    for path in _run_files(root, market, start, end):
+        schema = _read_schema(os.path.dirname(path))
+        descriptors.update(dict.fromkeys(schema['keys'] if schema else []))
+    return list(descriptors)
+
+
+def iter_history(root, market, start=None, end=None, where=None, columns=None):
+    filters = [(col, 'in', list(values)) for col, values in (where or {}).items()] or None
+    if columns is not None:
+        columns = list(dict.fromkeys([SNAPSHOT_COLUMN, KEY_COLUMN] + list(columns)))
+    for path in _run_files(root, market, start, end):
+        # One run file at a time, with column projection and row filters pushed down;
+        # the feed's columns can change between runs, so project what each file has
+        names = pq.read_schema(path).names
+        if filters and any(col not in names for col, _, _ in filters):
+            continue
+        file_columns = [col for col in columns if col in names] if columns is not None else None
+        table = pq.read_table(path, columns=file_columns, filters=filters)
+        if table.num_rows:
+            yield table.to_pandas()
+
+
+def load_history(root, market, start=None, end=None, where=None, columns=None):
+    frames = list(iter_history(root, market, start, end, where, columns))
+    if not frames:
+        return pd.DataFrame(columns=[SNAPSHOT_COLUMN, KEY_COLUMN] + list(columns or []))
+    return pd.concat(frames, ignore_index=True)
+
+
+def line_movement(history_df, value_columns=('Price', 'ETS Score'), descriptors=None):
+    if history_df.empty:
+        return pd.DataFrame()
+    value_columns = [col for col in value_columns if col in history_df.columns]
+    history_df = history_df.sort_values([KEY_COLUMN, SNAPSHOT_COLUMN])
+    grouped = history_df.groupby(KEY_COLUMN, sort=False)
+
+    if descriptors is None:
+        descriptors = key_columns(history_df)
+    descriptors = [col for col in descriptors if col in history_df.columns]
+    movement = grouped[descriptors].first()
+    movement['First Seen'] = grouped[SNAPSHOT_COLUMN].min()
+    movement['Last Change'] = grouped[SNAPSHOT_COLUMN].max()
+    movement['Moves'] = grouped.size() - 1
+    for col in value_columns:
+        movement[f'Open {col}'] = grouped[col].first()
+        movement[f'Last {col}'] = grouped[col].last()
+        movement[f'{col} Move'] = movement[f'Last {col}'] - movement[f'Open {col}']
+    return movement.reset_index()
@@ -0,0 +1,114 @@
+import contextlib
+import json
+import logging
+import sys
+import time
+import uuid
+
+# === Hot-Path Instrumentation ===
+# One Recorder per script run. When disabled, stage() hands back a shared no-op
+# object so instrumented code pays for a context manager and nothing else.
+
+logger = logging.getLogger('mlb_odds.metrics')
+
+# Column order for the debug panel
+COLUMNS = [
+    'section', 'stage', 'wall_ms', 'rows_in', 'rows_out', 'frame_bytes', 'cached',
+    'bytes_downloaded', 'download_ms', 'parse_ms', 'payload_bytes',
+]
+
+
+def configure_logging():
+    # JSON lines on stderr for the metrics pipeline; safe to call on every rerun
+    if not logger.handlers:
+        handler = logging.StreamHandler(sys.stderr)
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        logger.addHandler(handler)
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+
+
+class _NullStage:
+    def output(self, df):
+        pass
+
+    def loaded(self, df):
+        pass
+
+    def payload(self, html_str):
+        pass
+
+
+_NULL_STAGE = _NullStage()
+
+
+class _Stage:
+    # Frames and payloads are only held here; measure() sizes them after the stage's
+    # timer stops, so the deep memory walk isn't billed to the stage it describes
+    def __init__(self, record):
+        self.record = record
+        self.started_at = time.time()
+        self.frame = None
+        self.source = None
+        self.html_str = None
+
+    def output(self, df):
+        self.frame = df
+
+    def loaded(self, df):
+        self.frame = df
+        self.source = df.attrs.get('source', {})
+
+    def payload(self, html_str):
+        self.html_str = html_str
+
+    def measure(self):
+        if self.frame is not None:
+            self.record['rows_out'] = len(self.frame)
+            self.record['frame_bytes'] = int(self.frame.memory_usage(deep=True).sum())
+        if self.source is not None:
+            # pipeline.load_csv stamps download stats on the frame, and st.cache_data hands the
+            # same stamp back on every hit; only report them when the fetch happened in this stage
+            source = dict(self.source)
+            fetched_at = source.pop('fetched_at', None)
+            self.record['cached'] = fetched_at is None or fetched_at < self.started_at
+            if not self.record['cached']:
+                self.record.update(source)
+        if self.html_str is not None:
+            self.record['payload_bytes'] = len(self.html_str.encode('utf-8'))
+
+
+class Recorder:
+    def __init__(self, enabled=False, log=False):
+        self.enabled = enabled or log
+        self.log = log
+        self.run_id = uuid.uuid4().hex[:12]
+        self.records = []
+        self.started = time.perf_counter()
+
+    @contextlib.contextmanager
+    def stage(self, section, name, df_in=None):
+        if not self.enabled:
+            yield _NULL_STAGE
+            return
+        record = {'event': 'stage', 'run_id': self.run_id, 'section': section, 'stage': name}
+        if df_in is not None:
+            record['rows_in'] = len(df_in)
+        stage = _Stage(record)
+        start = time.perf_counter()
+        try:
+            yield stage
+        finally:
+            record['wall_ms'] = round((time.perf_counter() - start) * 1000, 3)
+            stage.measure()
+            self.records.append(record)
+            if self.log:
+                logger.info(json.dumps(record, default=str))
+
+    def elapsed_ms(self):
+        return round((time.perf_counter() - self.started) * 1000, 3)
+
+    def finish(self):
+        # Whole-run summary, so per-stage records can be checked against the total
+        if self.log:
+            logger.info(json.dumps({'event': 'run', 'run_id': self.run_id, 'wall_ms': self.elapsed_ms(), 'stages': len(self.records)}))
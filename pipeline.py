@@ -0,0 +1,167 @@
+import io
+import time
+import pandas as pd
+import numpy as np
+import plotly.express as px
+import requests
+
+# === Shared Chart Config ===
+# Disable zoom/pan/select, allow hover
+PLOT_CONFIG = {
+    'displayModeBar': False,
+    'staticPlot': False,
+    'scrollZoom': False,
+    'editable': False,
+    'doubleClick': False,
+    'displaylogo': False
+}
+
+
+# === Parse ===
+def fetch(url):
+    response = requests.get(url)
+    response.raise_for_status()
+    return response.content
+
+
+def load_csv(url):
+    # Download and parse separately so slow pages can be pinned on one or the other
+    start = time.perf_counter()
+    content = fetch(url)
+    downloaded = time.perf_counter()
+    df = pd.read_csv(io.BytesIO(content), index_col=False)
+    df.attrs['source'] = {
+        'fetched_at': time.time(),
+        'bytes_downloaded': len(content),
+        'download_ms': round((downloaded - start) * 1000, 3),
+        'parse_ms': round((time.perf_counter() - downloaded) * 1000, 3),
+    }
+    return df
+
+
+# === Transform ===
+def ets_transform(df):
+    # Signed log scale so a handful of extreme ETS scores don't flatten the rest
+    df['ETS Score'] = np.where(df['ETS Score'] == 0, 0, np.sign(df['ETS Score']) * np.log1p(np.abs(df['ETS Score'])))
+    return df
+
+
+# === Filter ===
+def filter_frame(df, isin=None, between=None):
+    # isin: {column: selected values}, skipped when nothing is selected
+    # between: {column: (low, high)}, always applied
+    filtered = df.copy()
+    for column, selected in (isin or {}).items():
+        if selected:
+            filtered = filtered[filtered[column].isin(selected)]
+    if between:
+        mask = pd.Series(True, index=filtered.index)
+        for column, value_range in between.items():
+            mask &= filtered[column].between(*value_range)
+        filtered = filtered[mask]
+    return filtered
+
+
+# === Frontier ===
+def mark_pareto(df, score_column='ETS Score'):
+    # Sort and mark Pareto-optimal
+    df_sorted = df.sort_values(by=score_column, ascending=False).copy()
+
+    df_sorted['is_pareto'] = False
+    positive_roi = df_sorted[df_sorted[score_column] > 0].sort_values(by=score_column, ascending=False)
+    pareto_indices, max_price = [], None
+    for idx, row in positive_roi.iterrows():
+        if max_price is None or row['Price'] >= max_price:
+            pareto_indices.append(idx)
+            max_price = row['Price']
+    df_sorted.loc[pareto_indices, 'is_pareto'] = True
+
+    # Assign colors
+    def assign_color(row):
+        if row[score_column] <= 0:
+            return '#5A5A5A'
+        elif row['is_pareto']:
+            return '#FF6F91'
+        else:
+            return '#00B8D9'
+    df_sorted['marker_color'] = df_sorted.apply(assign_color, axis=1)
+    return df_sorted
+
+
+# === Figure ===
+def build_top_bets_figure_ets(df_sorted, title="", hover_columns=None):
+    # Expects the output of mark_pareto, so the frontier can be timed on its own
+
+    # Default hover columns
+    base_hover = ['Price', 'ETS Score']
+    if hover_columns:
+        hover_cols = base_hover + hover_columns
+    else:
+        hover_cols = base_hover
+
+    hover_cols = list(set(hover_cols))
+
+    # Base scatter plot
+    fig = px.scatter(
+        df_sorted,
+        x='Price',
+        y='ETS Score',
+        hover_data=hover_cols,
+        title=title,
+    )
+    fig.update_traces(marker=dict(size=5), marker_color=df_sorted['marker_color'])
+    fig.add_scatter(
+        x=[None],
+        y=[None],
+        mode='markers',
+        name=' ',
+        marker=dict(opacity=0),
+        showlegend=True
+    )
+
+    # Add dashed Pareto line with custom hover
+    pareto_points = df_sorted[df_sorted['is_pareto']].sort_values(by='Price')
+    if len(pareto_points) >= 2:
+        fig.add_scatter(
+            x=pareto_points['Price'],
+            y=pareto_points['ETS Score'],
+            mode='lines+markers',
+            name='Top Bets',
+            line=dict(color='#FF6F91', width=2, dash='dash'),
+            marker=dict(color='#FF6F91', size=5),
+            customdata=pareto_points[hover_cols],
+            hovertemplate = '<br>'.join([f'{col}: %{{customdata[{i}]}}' for i, col in enumerate(hover_cols)]) + '<extra></extra>'
+        )
+
+    # Layout and interactivity lock
+    fig.update_layout(
+        width=600,
+        height=400,
+        plot_bgcolor='#121317',
+        paper_bgcolor='#121317',
+        font=dict(color='#FFFFFF'),
+        title_font=dict(size=20, color='#00B8D9'),
+        xaxis=dict(title_font=dict(color='#FFFFFF'), tickfont=dict(color='#FFFFFF')),
+        yaxis=dict(title_font=dict(color='#FFFFFF'), tickfont=dict(color='#FFFFFF')),
+        dragmode=False,
+        hovermode='closest',
+        legend=dict(
+            orientation="h",
+            yanchor="bottom",
+            y=1.02,
+            xanchor="center",
+            x=0.5,
+            font=dict(
+                size=14,           # or whatever matches your theme
+                color='#FFFFFF',
+                family='sans-serif'
+            )
+        ),
+        margin=dict(l=100, r=40, t=110, b=40)
+    )
+    return fig
+
+
+# === HTML ===
+def figure_html(fig):
+    return fig.to_html(full_html=False, include_plotlyjs='cdn', config=PLOT_CONFIG)
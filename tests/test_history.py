@@ -0,0 +1,154 @@
+import glob
+import multiprocessing
+import os
+
+import pandas as pd
+import pytest
+import streamlit as st
+from streamlit.testing.v1 import AppTest
+
+import history
+from benchmarks.server import feed_secrets, serve_feeds
+from benchmarks.synthetic import generate_slate, write_feeds
+
+DAY = '2026-10-18'
+
+
+def _snapshot(prices=(2.10, 1.80, 3.25), ets=(0.5, -0.2, 1.1)):
+    return pd.DataFrame({
+        'MLB Game ID': [776000, 776000, 776001],
+        'Bookmaker': ['DraftKings', 'FanDuel', 'DraftKings'],
+        'Team': ['BAL', 'BAL', 'TB'],
+        'Price': list(prices),
+        'ETS Score': list(ets),
+    })
+
+
+def _run_rows(root, market, run):
+    path = os.path.join(root, f"market={market}", f"date={DAY}", f"{pd.Timestamp(run):%Y%m%dT%H%M%S}.parquet")
+    return len(pd.read_parquet(path))
+
+
+def test_first_run_stores_full_snapshot(tmp_path):
+    assert history.append_snapshot(tmp_path, 'moneyline', _snapshot(), f'{DAY} 10:00') == 3
+
+
+def test_unchanged_rows_write_nothing(tmp_path):
+    history.append_snapshot(tmp_path, 'moneyline', _snapshot(), f'{DAY} 10:00')
+    assert history.append_snapshot(tmp_path, 'moneyline', _snapshot(), f'{DAY} 11:00') == 0
+    assert _run_rows(tmp_path, 'moneyline', f'{DAY} 11:00') == 0
+
+
+def test_same_run_is_recorded_once(tmp_path):
+    history.append_snapshot(tmp_path, 'moneyline', _snapshot(), f'{DAY} 10:00')
+    assert history.append_snapshot(tmp_path, 'moneyline', _snapshot(prices=(9, 9, 9)), f'{DAY} 10:00') == 0
+
+
+def test_changed_rows_write_deltas(tmp_path):
+    history.append_snapshot(tmp_path, 'moneyline', _snapshot(), f'{DAY} 10:00')
+    moved = _snapshot(prices=(2.20, 1.80, 3.25))
+    assert history.append_snapshot(tmp_path, 'moneyline', moved, f'{DAY} 11:00') == 1
+
+    delta = history.load_history(tmp_path, 'moneyline', start=f'{DAY} 10:30')
+    assert delta['Bookmaker'].tolist() == ['DraftKings']
+    assert delta['Price'].tolist() == [2.20]
+    assert (delta[history.SNAPSHOT_COLUMN] == pd.Timestamp(f'{DAY} 11:00')).all()
+
+
+def test_empty_first_snapshot(tmp_path):
+    empty = _snapshot().iloc[0:0]
+    assert history.append_snapshot(tmp_path, 'pitcher_props', empty, f'{DAY} 09:00') == 0
+    assert history.append_snapshot(tmp_path, 'pitcher_props', _snapshot(), f'{DAY} 10:00') == 3
+    assert history.append_snapshot(tmp_path, 'pitcher_props', _snapshot(), f'{DAY} 11:00') == 0
+
+
+def test_window_prunes_day_partitions(tmp_path):
+    history.append_snapshot(tmp_path, 'totals', _snapshot(), '2026-10-17 22:00')
+    history.append_snapshot(tmp_path, 'totals', _snapshot(), f'{DAY} 10:00')
+
+    paths = list(history._run_files(tmp_path, 'totals', start=DAY, end=f'{DAY} 23:59'))
+    assert [os.path.basename(os.path.dirname(path)) for path in paths] == [f'date={DAY}']
+
+    loaded = history.load_history(tmp_path, 'totals', start=DAY)
+    assert (loaded[history.SNAPSHOT_COLUMN] == pd.Timestamp(f'{DAY} 10:00')).all()
+    assert len(loaded) == 3
+
+
+def test_line_movement_open_last_move(tmp_path):
+    history.append_snapshot(tmp_path, 'moneyline', _snapshot(), f'{DAY} 10:00')
+    history.append_snapshot(tmp_path, 'moneyline', _snapshot(prices=(2.20, 1.80, 3.25), ets=(0.7, -0.2, 1.1)), f'{DAY} 11:00')
+    history.append_snapshot(tmp_path, 'moneyline', _snapshot(prices=(2.40, 1.80, 3.25), ets=(0.9, -0.2, 1.1)), f'{DAY} 12:00')
+
+    descriptors = history.descriptor_columns(tmp_path, 'moneyline')
+    assert descriptors == ['MLB Game ID', 'Bookmaker', 'Team']
+
+    day_history = history.load_history(tmp_path, 'moneyline', columns=descriptors + ['Price', 'ETS Score'])
+    movement = history.line_movement(day_history).set_index(['Bookmaker', 'Team'])
+
+    moved = movement.loc[('DraftKings', 'BAL')]
+    assert moved['Moves'] == 2
+    assert moved['Open Price'] == 2.10
+    assert moved['Last Price'] == 2.40
+    assert moved['Price Move'] == pytest.approx(0.30)
+    assert moved['ETS Score Move'] == pytest.approx(0.4)
+    assert moved['First Seen'] == pd.Timestamp(f'{DAY} 10:00')
+    assert moved['Last Change'] == pd.Timestamp(f'{DAY} 12:00')
+
+    flat = movement.loc[('FanDuel', 'BAL')]
+    assert flat['Moves'] == 0
+    assert flat['Price Move'] == 0
+
+
+def test_schema_change_within_day_keeps_keys(tmp_path):
+    history.append_snapshot(tmp_path, 'moneyline', _snapshot(), f'{DAY} 10:00')
+    widened = _snapshot(prices=(2.20, 1.80, 3.25)).assign(Opponent=['TB', 'TB', 'BAL'])
+    assert history.append_snapshot(tmp_path, 'moneyline', widened, f'{DAY} 11:00') == 1
+    assert history.append_snapshot(tmp_path, 'moneyline', _snapshot(prices=(2.20, 1.80, 3.25)), f'{DAY} 12:00') == 0
+
+    descriptors = history.descriptor_columns(tmp_path, 'moneyline')
+    assert descriptors == ['MLB Game ID', 'Bookmaker', 'Team']
+    day_history = history.load_history(tmp_path, 'moneyline', columns=descriptors + ['Price', 'Opponent'])
+    assert len(day_history) == 4
+    assert len(history.load_history(tmp_path, 'moneyline', where={'Opponent': ['TB']})) == 1
+
+    movement = history.line_movement(day_history, descriptors=descriptors)
+    assert len(movement) == 3
+    assert sorted(movement['Moves']) == [0, 0, 1]
+
+
+def _append(root):
+    return history.append_snapshot(root, 'moneyline', _snapshot(), f'{DAY} 10:00')
+
+
+def test_concurrent_appends_record_once(tmp_path):
+    with multiprocessing.get_context('spawn').Pool(6) as pool:
+        written = pool.map(_append, [str(tmp_path)] * 6)
+
+    assert sorted(written) == [0, 0, 0, 0, 0, 3]
+    day_dir = os.path.join(tmp_path, 'market=moneyline', f'date={DAY}')
+    assert not glob.glob(os.path.join(day_dir, '*.tmp'))
+    assert len(history.load_history(tmp_path, 'moneyline')) == 3
+
+
+def test_new_simulation_start_records_new_prices(tmp_path):
+    # The app caches the feeds; a new start time must not record the cached frame under it
+    feeds, root = str(tmp_path / 'feeds'), str(tmp_path / 'history')
+    slate = generate_slate(n_games=2, n_books=3)
+    write_feeds(slate, feeds, simulation_start=f'{DAY} 10:00:00')
+    st.cache_data.clear()
+    with serve_feeds(feeds) as base_url:
+        at = AppTest.from_file(os.path.join(os.path.dirname(os.path.dirname(__file__)), 'app.py'), default_timeout=120)
+        for key, value in feed_secrets(base_url).items():
+            at.secrets[key] = value
+        at.secrets['HISTORY_DIR'] = root
+        at.run()
+        assert not at.exception
+
+        slate['moneyline']['Price'] += 0.05
+        write_feeds(slate, feeds, simulation_start=f'{DAY} 11:00:00')
+        at.run()
+        assert not at.exception
+
+    moved = history.load_history(root, 'moneyline', start=f'{DAY} 10:30')
+    assert len(moved) == len(slate['moneyline'])
+    assert sorted(moved['Price']) == pytest.approx(sorted(slate['moneyline']['Price']))